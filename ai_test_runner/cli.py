@@ -6,8 +6,15 @@ AI Test Runner - Compiles, executes, and provides coverage for AI-generated test
 import os
 import sys
 import argparse
+import functools
+import hashlib
+import json
 import shutil
+import signal
 import subprocess
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 import glob
 import re
@@ -16,6 +23,86 @@ import re
 sys.path.append(str(Path(__file__).parent.parent.parent / "ai-c-test-generator"))
 from ai_c_test_generator.analyzer import DependencyAnalyzer
 
+# Longest multi-line signature carried over while looking for its opening brace
+_MAX_SIGNATURE_CHARS = 1024
+# Seconds a single test executable may run before it is killed
+_TEST_TIMEOUT_SECONDS = 30
+# Bytes of test stdout kept for the report; the middle is dropped beyond this
+_MAX_REPORT_OUTPUT = 64 * 1024
+# Character budget for the .gcda paths in one gcov command line, kept under the
+# 32K limit on Windows (POSIX ARG_MAX is far larger)
+_MAX_GCOV_ARGS_CHARS = 30000
+# Longest piece of a stdout line read at once; longer lines arrive in pieces
+_MAX_READ_LINE = 8 * 1024
+# Input digests of the last successful build, relative to the output directory
+_MANIFEST_NAME = ".ai_runner_manifest.json"
+# Manifest key for the runner itself, so an upgrade (e.g. a new CMakeLists template) restages
+_RUNNER_MANIFEST_KEY = "<ai-test-runner>"
+
+# Function definitions like: float raw_to_celsius(int raw) {
+# Captures the function name (second word), not the return type
+_FUNC_DEF_RE = re.compile(r'\b\w+\s+(\w+)\s*\([^)]*\)\s*\{')
+# Any word followed by a parameter list and an opening brace: word( parameters ){
+_STUB_DEF_RE = re.compile(r'(\w+)\s*\([^)]*\)\s*\{', re.MULTILINE)
+# Unity summary line, e.g. "5 Tests 0 Failures 0 Ignored"
+_UNITY_SUMMARY_RE = re.compile(rb'^(\d+)\s+Tests\s+(\d+)\s+Failures', re.M)
+
+
+def _link_or_copy(src, dst):
+    """Stage src at dst as a hard link, falling back to a copy (e.g. across filesystems)
+
+    Links cost a metadata update instead of a full copy and share the source's
+    mtime, so the build only recompiles files that actually changed.
+    """
+    try:
+        if os.path.samefile(src, dst):
+            return dst
+        os.unlink(dst)
+    except FileNotFoundError:
+        pass
+    try:
+        os.link(src, dst)
+    except OSError:
+        shutil.copy(src, dst)
+    return dst
+
+
+def _file_digest(path):
+    """Return the blake2b hex digest of a file's contents"""
+    digest = hashlib.blake2b()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(64 * 1024), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+@functools.lru_cache(maxsize=None)
+def _which(tool, path=None):
+    """shutil.which, memoized so each tool's PATH walk happens once per process"""
+    return shutil.which(tool, path=path)
+
+
+@functools.lru_cache(maxsize=1)
+def _find_coverage_tool():
+    """Locate a coverage tool once per process
+
+    Prefers lcov + genhtml, which is considerably faster than gcovr on large
+    projects, then gcovr. Returns ('lcov', None), ('gcovr', path) or (None, None).
+    """
+    if _which("lcov") and _which("genhtml"):
+        return "lcov", None
+
+    # gcovr on PATH, else the user Scripts directory pip --user installs into on Windows
+    gcovr_path = _which("gcovr")
+    if not gcovr_path:
+        import site
+        scripts_dir = site.getusersitepackages().replace('site-packages', 'Scripts')
+        gcovr_path = _which("gcovr", path=scripts_dir)
+    if gcovr_path:
+        return "gcovr", gcovr_path
+
+    return None, None
+
 
 class AITestRunner:
     """AI Test Runner - Builds, executes, and covers AI-generated tests"""
@@ -27,6 +114,13 @@ class AITestRunner:
         self.verification_dir = self.tests_dir / "compilation_report"
         self.test_reports_dir = self.tests_dir / "test_reports"
         self.source_dir = self.repo_path / "src"
+        self._compilable_cache = None
+
+        # Resolve external tools once per runner rather than walking PATH on each use
+        self._cmake = _which("cmake") or "cmake"
+        self._coverage_tool, self._gcovr = _find_coverage_tool()
+        self._lcov = _which("lcov") if self._coverage_tool == "lcov" else None
+        self._genhtml = _which("genhtml") if self._coverage_tool == "lcov" else None
 
         # Initialize dependency analyzer
         self.analyzer = DependencyAnalyzer(str(self.repo_path))
@@ -36,48 +130,77 @@ class AITestRunner:
         # Create test reports directory
         self.test_reports_dir.mkdir(parents=True, exist_ok=True)
 
+    @staticmethod
+    def _scan_function_names(test_file_path, pattern, excluded_prefixes):
+        """Return function names matched by pattern in a test file, minus excluded prefixes
+
+        The file is scanned line by line so memory stays flat for large tests.
+        Signatures split across lines (parameters continuing, or the opening
+        brace on its own line) are carried over until the brace appears, up to
+        _MAX_SIGNATURE_CHARS so a stray "(" cannot make the carry grow unbounded.
+        """
+        names = set()
+        pending = ''
+        with open(test_file_path, 'r', errors='ignore') as f:
+            for line in f:
+                if pending:
+                    line = pending + line
+                    pending = ''
+                for name in pattern.findall(line):
+                    if not name.startswith(excluded_prefixes):
+                        names.add(name)
+                if ('{' not in line and len(line) <= _MAX_SIGNATURE_CHARS
+                        and (line.count('(') > line.count(')') or line.rstrip().endswith(')'))):
+                    pending = line
+        return names
+
     def get_stubbed_functions_in_test(self, test_file_path: str) -> set:
         """Detect function stubs in a test file by parsing function definitions"""
-        stubbed_functions = set()
         try:
-            with open(test_file_path, 'r') as f:
-                content = f.read()
-
-            # Match function definitions like: float raw_to_celsius(int raw) {
-            # Capture the function name (second word), not the return type
-            matches = re.findall(r'\b\w+\s+(\w+)\s*\([^)]*\)\s*{', content)
-            stubbed_functions = set(matches)
-
             # Remove test functions (they start with "test_")
-            stubbed_functions = {func for func in stubbed_functions if not func.startswith('test_')}
-
+            return self._scan_function_names(test_file_path, _FUNC_DEF_RE, ('test_',))
         except Exception as e:
             print(f"Warning: Could not parse stubs from {test_file_path}: {e}")
-
-        return stubbed_functions
+            return set()
 
     def find_compilable_tests(self):
         """Find test files that have compiles_yes in verification reports"""
+        # Results are invariant for a run, so reuse them across pipeline stages
+        if self._compilable_cache is not None:
+            return self._compilable_cache
+
         compilable_tests = []
 
         if not self.verification_dir.exists():
             print(f"❌ Verification report directory not found: {self.verification_dir}")
             return compilable_tests
 
-        # Find all compiles_yes files
-        for report_file in self.verification_dir.glob("*compiles_yes.txt"):
+        # Find all compiles_yes files in a single directory pass
+        suffix = "_compiles_yes.txt"
+        with os.scandir(self.verification_dir) as entries:
+            report_names = [entry.name for entry in entries if entry.name.endswith(suffix)]
+
+        # Check report targets against one listing of the tests directory
+        try:
+            with os.scandir(self.tests_dir) as entries:
+                existing_tests = {entry.name for entry in entries if entry.is_file()}
+        except FileNotFoundError:
+            existing_tests = set()
+
+        for report_name in report_names:
             # Extract test filename from report filename
             # Format: test_filename_compiles_yes.txt -> test_filename.c
-            base_name = report_file.stem.replace("_compiles_yes", "")
+            base_name = report_name[:-len(suffix)]
             test_file = self.tests_dir / f"{base_name}.c"
 
-            if test_file.exists():
+            if test_file.name in existing_tests:
                 # Return the full Path object for file operations
                 compilable_tests.append(test_file)
                 print(f"✅ Found compilable test: {test_file.name}")
             else:
                 print(f"⚠️  Test file not found: {test_file.name}")
 
+        self._compilable_cache = compilable_tests
         return compilable_tests
 
     def run(self):
@@ -136,44 +259,36 @@ class AITestRunner:
                     shutil.rmtree(unity_dest)
                 except (OSError, PermissionError):
                     print(f"⚠️  Could not remove existing unity directory: {unity_dest}")
-            shutil.copytree(unity_source, unity_dest)
+            shutil.copytree(unity_source, unity_dest, copy_function=_link_or_copy)
             print("✅ Copied Unity framework from reference")
             return
 
         # If not available, download Unity
         print("📥 Downloading Unity framework...")
+        import io
         import urllib.request
         import zipfile
-        import tempfile
 
         try:
-            # Download Unity from GitHub
+            # Download Unity from GitHub straight into memory (the archive is small)
             unity_url = "https://github.com/ThrowTheSwitch/Unity/archive/refs/heads/master.zip"
-            with tempfile.NamedTemporaryFile(suffix='.zip', delete=False) as temp_zip:
-                urllib.request.urlretrieve(unity_url, temp_zip.name)
-
-                # Extract Unity
-                with zipfile.ZipFile(temp_zip.name, 'r') as zip_ref:
-                    # Extract only the src directory
-                    for member in zip_ref.namelist():
-                        if member.startswith('Unity-master/src/'):
-                            # Remove the Unity-master/src/ prefix
-                            target_path = member.replace('Unity-master/src/', 'src/')
-                            if target_path.endswith('/'):
-                                (unity_dest / target_path).mkdir(parents=True, exist_ok=True)
-                            else:
-                                zip_ref.extract(member, unity_dest.parent / "temp_unity")
-                                source_file = unity_dest.parent / "temp_unity" / member
-                                target_file = unity_dest / target_path
-                                target_file.parent.mkdir(parents=True, exist_ok=True)
-                                shutil.move(source_file, target_file)
-
-                # Clean up
-                import os
-                os.unlink(temp_zip.name)
-                temp_dir = unity_dest.parent / "temp_unity"
-                if temp_dir.exists():
-                    shutil.rmtree(temp_dir)
+            with urllib.request.urlopen(unity_url) as response:
+                archive = io.BytesIO(response.read())
+
+            # Extract only the src directory, streaming each member to its target
+            unity_root = unity_dest.resolve()
+            with zipfile.ZipFile(archive) as zip_ref:
+                for member in zip_ref.infolist():
+                    if not member.filename.startswith('Unity-master/src/') or member.is_dir():
+                        continue
+                    # Remove the Unity-master/src/ prefix
+                    target_file = (unity_dest / member.filename.replace('Unity-master/src/', 'src/')).resolve()
+                    # Skip members whose path (e.g. "../") would land outside unity_dest
+                    if unity_root not in target_file.parents:
+                        continue
+                    target_file.parent.mkdir(parents=True, exist_ok=True)
+                    with zip_ref.open(member) as src, open(target_file, 'wb') as dst:
+                        shutil.copyfileobj(src, dst, 64 * 1024)
 
             print("✅ Downloaded Unity framework")
 
@@ -182,24 +297,34 @@ class AITestRunner:
             print("⚠️  Unity framework not available, tests may not compile")
 
     def create_cmake_lists(self, test_files):
-        cmake_content = "cmake_minimum_required(VERSION 3.10)\n"
-        cmake_content += "project(Tests C)\n\n"
-        cmake_content += "set(CMAKE_C_STANDARD 99)\n"
-        cmake_content += "add_definitions(-DUNIT_TEST)\n\n"
-        # Add coverage compilation flags
-        cmake_content += "set(CMAKE_C_FLAGS \"${CMAKE_C_FLAGS} --coverage\")\n"
-        cmake_content += "set(CMAKE_EXE_LINKER_FLAGS \"${CMAKE_EXE_LINKER_FLAGS} --coverage\")\n\n"
-        cmake_content += "include_directories(unity/src)\n"
-        cmake_content += "include_directories(src)\n\n"
-
-        # Add Unity source file
-        cmake_content += "add_library(unity unity/src/unity.c)\n\n"
-
-        source_files = [f for f in os.listdir(os.path.join(self.output_dir, 'src')) if f.endswith('.c')]
-        
+        lines = [
+            "cmake_minimum_required(VERSION 3.10)",
+            "project(Tests C)",
+            "",
+            "set(CMAKE_C_STANDARD 99)",
+            "add_definitions(-DUNIT_TEST)",
+            "",
+            # Add coverage compilation flags
+            "set(CMAKE_C_FLAGS \"${CMAKE_C_FLAGS} --coverage\")",
+            "set(CMAKE_EXE_LINKER_FLAGS \"${CMAKE_EXE_LINKER_FLAGS} --coverage\")",
+            "",
+            "include_directories(unity/src)",
+            "include_directories(src)",
+            "",
+            # Add Unity source file
+            "add_library(unity unity/src/unity.c)",
+            "",
+        ]
+
+        # The staged src/ directory does not change while the targets are emitted,
+        # so list it once and check membership in memory
+        staged_sources = set(os.listdir(os.path.join(self.output_dir, 'src')))
+        executable_names = []
+
         for test_file in test_files:
             test_name = os.path.splitext(os.path.basename(test_file))[0]
             executable_name = test_name
+            executable_names.append(executable_name)
 
             # --- SIMPLIFIED SOURCE FILE SELECTION ---
             # Determine the primary source file being tested (e.g., test_main.c -> main.c)
@@ -211,36 +336,34 @@ class AITestRunner:
 
             # Include the primary source file if it exists
             primary_source = os.path.join('src', source_under_test)
-            if os.path.exists(os.path.join(self.output_dir, 'src', source_under_test)):
+            if source_under_test in staged_sources:
                 test_sources.append(primary_source)
 
             # Convert backslashes to forward slashes for CMake compatibility
             test_sources = [src.replace('\\', '/') for src in test_sources]
             test_file_basename = os.path.basename(test_file).replace('\\', '/')
-            cmake_content += f"add_executable({executable_name} tests/{test_file_basename} {' '.join(test_sources)})\n"
-            cmake_content += f"target_link_libraries({executable_name} unity)\n\n"
+            lines.append(f"add_executable({executable_name} tests/{test_file_basename} {' '.join(test_sources)})")
+            lines.append(f"target_link_libraries({executable_name} unity)")
+            lines.append("")
+
+        # Aggregate target so CI can build all tests first, then run them in parallel
+        if executable_names:
+            lines.append("add_custom_target(compile_test_executables)")
+            lines.append(f"add_dependencies(compile_test_executables {' '.join(executable_names)})")
 
         with open(os.path.join(self.output_dir, 'CMakeLists.txt'), 'w') as f:
-            f.write(cmake_content)
+            f.write("\n".join(lines) + "\n")
         print(f"Created CMakeLists.txt with {len(test_files)} test targets")
 
     def _find_stubbed_functions(self, test_file_path):
         """Finds function names that are defined as stubs in a test file."""
-        stubs = set()
         try:
-            with open(test_file_path, 'r', errors='ignore') as f:
-                content = f.read()
-                # Regex to find function definitions that are not test_ or setUp/tearDown
-                # This matches: word( parameters ){ 
-                # The word before ( is the function name
-                pattern = re.compile(r'(\w+)\s*\([^)]*\)\s*{', re.MULTILINE)
-                for match in pattern.finditer(content):
-                    func_name = match.group(1)
-                    if not func_name.startswith(('test_', 'setUp', 'tearDown', 'main')):
-                        stubs.add(func_name)
+            # Skip test_ functions, Unity fixtures and main
+            return self._scan_function_names(
+                test_file_path, _STUB_DEF_RE, ('test_', 'setUp', 'tearDown', 'main')
+            )
         except FileNotFoundError:
-            pass
-        return stubs
+            return set()
 
     def copy_source_files(self):
         """Copy source files to build directory"""
@@ -248,13 +371,17 @@ class AITestRunner:
         src_build_dir.mkdir(exist_ok=True)
 
         if self.source_dir.exists():
-            for src_file in self.source_dir.glob("*.c"):
-                shutil.copy2(src_file, src_build_dir)
-                print(f"📋 Copied source: {src_file.name}")
-
-            for header_file in self.source_dir.glob("*.h"):
-                shutil.copy2(header_file, src_build_dir)
-                print(f"📋 Copied header: {header_file.name}")
+            # Stage by hard link where possible; see _link_or_copy
+            with os.scandir(self.source_dir) as entries:
+                for entry in entries:
+                    if entry.name.endswith('.c'):
+                        kind = "source"
+                    elif entry.name.endswith('.h'):
+                        kind = "header"
+                    else:
+                        continue
+                    _link_or_copy(entry.path, src_build_dir / entry.name)
+                    print(f"📋 Copied {kind}: {entry.name}")
         else:
             print(f"⚠️  Source directory not found: {self.source_dir}")
 
@@ -264,7 +391,7 @@ class AITestRunner:
         tests_build_dir.mkdir(exist_ok=True)
 
         for test_file in test_files:
-            shutil.copy2(test_file, tests_build_dir)
+            _link_or_copy(test_file, tests_build_dir / test_file.name)
             print(f"📋 Copied test: {test_file.name}")
 
     def build_tests(self):
@@ -272,9 +399,14 @@ class AITestRunner:
         print("🔨 Building tests...")
 
         try:
-            # Configure with CMake (CMakeLists.txt is in the build directory)
+            # Configure with CMake (CMakeLists.txt is in the build directory).
+            # Prefer Ninja for finer-grained parallel scheduling, but only on a fresh
+            # build directory since CMake refuses to switch generators in place.
+            configure_cmd = [self._cmake, "."]
+            if _which("ninja") and not (self.output_dir / "CMakeCache.txt").exists():
+                configure_cmd += ["-G", "Ninja"]
             result = subprocess.run(
-                ["cmake", "."],
+                configure_cmd,
                 cwd=self.output_dir,
                 capture_output=True,
                 text=True,
@@ -282,9 +414,11 @@ class AITestRunner:
             )
             print("✅ CMake configuration successful")
 
-            # Build with cmake --build (works with any generator)
+            # Build with cmake --build (works with any generator), one job per core
+            # unless CMAKE_BUILD_PARALLEL_LEVEL caps it (e.g. on memory-bound CI workers)
+            jobs = os.environ.get("CMAKE_BUILD_PARALLEL_LEVEL") or str(os.cpu_count() or 4)
             result = subprocess.run(
-                ["cmake", "--build", "."],
+                [self._cmake, "--build", ".", "--parallel", jobs],
                 cwd=self.output_dir,
                 capture_output=True,
                 text=True,
@@ -309,84 +443,46 @@ class AITestRunner:
 
         test_results = []
         self.passed_test_executables = []  # Track passing tests for coverage
-        test_executables = [exe for exe in self.output_dir.glob("*test*") 
-                           if exe.is_file() and exe.suffix in ['.exe', ''] and 'CTest' not in exe.name]
+        with os.scandir(self.output_dir) as entries:
+            test_executables = [exe for exe in entries
+                                if 'test' in exe.name and 'CTest' not in exe.name
+                                and os.path.splitext(exe.name)[1] in ('', '.exe')
+                                and exe.is_file(follow_symlinks=False)
+                                and self._is_executable(exe)]
+        test_executables.sort(key=lambda exe: exe.name)
 
         if not test_executables:
             print("❌ No test executables found")
             return test_results
 
-        for exe in test_executables:
-            if exe.is_file() and os.access(exe, os.X_OK):
+        # Test binaries are independent processes, so run them concurrently. Workers
+        # stream and tally each test's output as it runs; results are collected here
+        # as each one finishes. No per-worker GCOV_PREFIX is needed: each target writes
+        # its .gcda files under its own CMakeFiles/<target>.dir, and libgcov locks and
+        # merges the one shared file (the unity library's counters) on exit.
+        with ThreadPoolExecutor(max_workers=os.cpu_count()) as executor:
+            futures = {}
+            for exe in test_executables:
                 print(f"   Running {exe.name}...")
-                try:
-                    result = subprocess.run(
-                        [str(exe)],
-                        cwd=self.output_dir,
-                        capture_output=True,
-                        text=True,
-                        timeout=30
-                    )
-
-                    # Parse Unity test output to count individual tests
-                    individual_tests = 0
-                    individual_passed = 0
-                    individual_failed = 0
-
-                    for line in result.stdout.split('\n'):
-                        line = line.strip()
-                        if ':PASS' in line:
-                            individual_tests += 1
-                            individual_passed += 1
-                        elif ':FAIL' in line:
-                            individual_tests += 1
-                            individual_failed += 1
-                        elif line.endswith('Tests') and 'Failures' in line:
-                            # Parse summary line like "5 Tests 0 Failures 0 Ignored"
-                            parts = line.split()
-                            if len(parts) >= 3:
-                                try:
-                                    individual_tests = int(parts[0])
-                                    individual_failed = int(parts[2])
-                                    individual_passed = individual_tests - individual_failed
-                                except ValueError:
-                                    pass
-
-                    success = result.returncode == 0
-                    test_results.append({
-                        'name': exe.name,
-                        'success': success,
-                        'output': result.stdout,
-                        'errors': result.stderr,
-                        'returncode': result.returncode,
-                        'individual_tests': individual_tests,
-                        'individual_passed': individual_passed,
-                        'individual_failed': individual_failed
-                    })
-
-                    # Track passing tests for coverage generation
-                    if success:
-                        self.passed_test_executables.append(exe.name)
-
-                    status = "✅" if success else "❌"
-                    if individual_tests > 0:
-                        print(f"   {status} {exe.name} ({individual_passed}/{individual_tests} tests passed)")
-                    else:
-                        print(f"   {status} {exe.name} (exit code: {result.returncode})")
+                futures[executor.submit(self._run_single_exe, exe)] = exe
 
-                except subprocess.TimeoutExpired:
+            for future in as_completed(futures):
+                exe = futures[future]
+                try:
+                    result = future.result()
+                except subprocess.TimeoutExpired as e:
                     test_results.append({
                         'name': exe.name,
                         'success': False,
-                        'output': '',
-                        'errors': 'Test timed out',
+                        'output': e.output or '',
+                        'errors': f"Test timed out\n{e.stderr}" if e.stderr else 'Test timed out',
                         'returncode': -1,
                         'individual_tests': 0,
                         'individual_passed': 0,
                         'individual_failed': 0
                     })
                     print(f"   ⏰ {exe.name} timed out")
-
+                    continue
                 except Exception as e:
                     test_results.append({
                         'name': exe.name,
@@ -399,16 +495,160 @@ class AITestRunner:
                         'individual_failed': 0
                     })
                     print(f"   ❌ {exe.name} failed: {e}")
+                    continue
 
+                test_results.append(result)
+
+                # Track passing tests for coverage generation
+                if result['success']:
+                    self.passed_test_executables.append(exe.name)
+
+                status = "✅" if result['success'] else "❌"
+                if result['individual_tests'] > 0:
+                    print(f"   {status} {exe.name} ({result['individual_passed']}/{result['individual_tests']} tests passed)")
+                else:
+                    print(f"   {status} {exe.name} (exit code: {result['returncode']})")
+
+        # Report in executable order regardless of which test finished first
+        order = {exe.name: index for index, exe in enumerate(test_executables)}
+        test_results.sort(key=lambda result: order[result['name']])
+        self.passed_test_executables.sort(key=order.__getitem__)
         return test_results
 
+    @staticmethod
+    def _is_executable(entry):
+        """Check an os.DirEntry for execute permission using its stat result"""
+        # Windows has no reliable execute bits, so go by extension there
+        if os.name == 'nt':
+            return entry.name.endswith('.exe')
+        return bool(entry.stat(follow_symlinks=False).st_mode & 0o111)
+
+    def _run_single_exe(self, exe):
+        """Run one test executable (an os.DirEntry) and build its result dict
+
+        Unity output is tallied line by line while the test runs instead of being
+        buffered whole; only the head and tail of stdout are kept for the report.
+        Output stays as bytes and only the kept part is decoded.
+        """
+        # stdin is closed so a test waiting on input fails fast instead of blocking
+        # on the terminal until the watchdog fires. The test gets its own process
+        # group so processes it spawns can be killed along with it.
+        proc = subprocess.Popen(
+            [exe.path],
+            cwd=self.output_dir,
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            start_new_session=True
+        )
+
+        # Kill the test if it runs past the timeout
+        timed_out = threading.Event()
+
+        def kill():
+            timed_out.set()
+            self._kill_process_group(proc)
+
+        watchdog = threading.Timer(_TEST_TIMEOUT_SECONDS, kill)
+        watchdog.start()
+
+        # Drain stderr on the side so a chatty test cannot block on a full pipe
+        stderr_chunks = []
+        stderr_reader = threading.Thread(target=lambda: stderr_chunks.append(proc.stderr.read()))
+        stderr_reader.start()
+
+        individual_passed = 0
+        individual_failed = 0
+        summary = None
+        head, head_size = [], 0
+        tail, tail_size = deque(), 0
+        truncated = 0
+        try:
+            for line in iter(functools.partial(proc.stdout.readline, _MAX_READ_LINE), b''):
+                # Count Unity per-test markers, e.g. "test_foo.c:12:test_add:PASS"
+                if b':PASS' in line:
+                    individual_passed += 1
+                elif b':FAIL' in line:
+                    individual_failed += 1
+                elif b'Tests' in line:
+                    summary = _UNITY_SUMMARY_RE.match(line) or summary
+
+                # Keep the start and end of the output, dropping the middle
+                head_room = _MAX_REPORT_OUTPUT // 2 - head_size
+                if head_room > 0:
+                    head.append(line[:head_room])
+                    head_size += min(len(line), head_room)
+                    line = line[head_room:]
+                    if not line:
+                        continue
+                tail.append(line)
+                tail_size += len(line)
+                while tail_size > _MAX_REPORT_OUTPUT // 2:
+                    dropped = len(tail.popleft())
+                    tail_size -= dropped
+                    truncated += dropped
+
+            returncode = proc.wait()
+        finally:
+            watchdog.cancel()
+            if proc.poll() is None:
+                self._kill_process_group(proc)
+            stderr_reader.join()
+            proc.stdout.close()
+            proc.stderr.close()
+
+        output = b''.join(head).decode('utf-8', errors='replace')
+        if truncated:
+            output += f"\n... ({truncated} bytes of output truncated) ...\n"
+        output += b''.join(tail).decode('utf-8', errors='replace')
+        errors = b''.join(stderr_chunks).decode('utf-8', errors='replace')
+
+        # Keep what the test printed before it hung for the report
+        if timed_out.is_set():
+            raise subprocess.TimeoutExpired(exe.path, _TEST_TIMEOUT_SECONDS, output=output, stderr=errors)
+
+        individual_tests = individual_passed + individual_failed
+        # Prefer the summary line when present
+        if summary:
+            individual_tests = int(summary.group(1))
+            individual_failed = int(summary.group(2))
+            individual_passed = individual_tests - individual_failed
+
+        return {
+            'name': exe.name,
+            'success': returncode == 0,
+            'output': output,
+            'errors': errors,
+            'returncode': returncode,
+            'individual_tests': individual_tests,
+            'individual_passed': individual_passed,
+            'individual_failed': individual_failed
+        }
+
+    @staticmethod
+    def _kill_process_group(proc):
+        """Kill a test and any children it spawned
+
+        Children inherit the test's stdout/stderr pipes, so killing only the test
+        would leave its output readers blocked until they exit.
+        """
+        if os.name == 'nt':
+            proc.kill()
+            return
+        try:
+            os.killpg(proc.pid, signal.SIGKILL)
+        except OSError:
+            pass
+
     def generate_test_reports(self, test_results):
         """Generate individual test reports for each test executable"""
         print(f"📝 Generating individual test reports in {self.test_reports_dir}...")
 
         # Clean old reports
-        for old_report in self.test_reports_dir.glob("*_report.txt"):
-            old_report.unlink()
+        with os.scandir(self.test_reports_dir) as entries:
+            for entry in entries:
+                if entry.name.endswith("_report.txt") and entry.is_file(follow_symlinks=False):
+                    os.unlink(entry.path)
 
         for result in test_results:
             report_file = self.test_reports_dir / f"{result['name']}_report.txt"
@@ -478,53 +718,21 @@ class AITestRunner:
                 except Exception:
                     pass  # Ignore cleanup errors
 
-        # Try lcov first, then fallback to gcovr
-        coverage_tool = None
-        lcov_path = None
-        gcovr_path = None
-
-        try:
-            # Try lcov first
-            subprocess.run(["lcov", "--version"], capture_output=True, check=True)
-            coverage_tool = "lcov"
+        coverage_tool = self._coverage_tool
+        if coverage_tool == "lcov":
             print("   Using lcov for coverage generation")
-        except (subprocess.CalledProcessError, FileNotFoundError):
-            try:
-                # Try to find gcovr in common locations
-                import site
-                user_site = site.getusersitepackages()
-                scripts_dir = user_site.replace('site-packages', 'Scripts')
-
-                possible_gcovr_paths = [
-                    "gcovr",  # In PATH
-                    f"{scripts_dir}\\gcovr.exe",  # Windows user Scripts
-                    f"{scripts_dir}\\gcovr",  # Alternative
-                ]
-
-                for path in possible_gcovr_paths:
-                    try:
-                        subprocess.run([path, "--version"], capture_output=True, check=True)
-                        gcovr_path = path
-                        break
-                    except (subprocess.CalledProcessError, FileNotFoundError):
-                        continue
-
-                if gcovr_path:
-                    coverage_tool = "gcovr"
-                    print("   Using gcovr for coverage generation (lcov not available)")
-                else:
-                    raise FileNotFoundError("gcovr not found")
-
-            except (subprocess.CalledProcessError, FileNotFoundError):
-                print("❌ Neither lcov nor gcovr found. Install with: pip install gcovr")
-                print("⚠️  Coverage reports not available - install lcov or gcovr for detailed coverage analysis")
-                return False
+        elif coverage_tool == "gcovr":
+            print("   Using gcovr for coverage generation (lcov not available)")
+        else:
+            print("❌ Neither lcov nor gcovr found. Install with: pip install gcovr")
+            print("⚠️  Coverage reports not available - install lcov or gcovr for detailed coverage analysis")
+            return False
 
         try:
             if coverage_tool == "lcov":
                 return self._generate_coverage_lcov(total_individual_passed)
             else:
-                return self._generate_coverage_gcovr(gcovr_path)
+                return self._generate_coverage_gcovr(self._gcovr)
 
         except subprocess.CalledProcessError as e:
             print(f"❌ Coverage generation failed: {e.stderr}")
@@ -536,10 +744,19 @@ class AITestRunner:
             print("On Windows: pip install gcovr")
             print("⚠️  Coverage reports not available - install lcov or gcovr for detailed coverage analysis")
             return False
+        except OSError as e:
+            print(f"❌ Coverage generation failed: {e}")
+            return False
+
+    def _has_gcda_files(self):
+        """Return True as soon as any .gcda file is found under the build directory"""
+        for _, _, files in os.walk(self.output_dir):
+            if any(name.endswith('.gcda') for name in files):
+                return True
+        return False
 
     def _generate_coverage_lcov(self, total_individual_passed=0):
         """Generate coverage reports using lcov"""
-        coverage_info = self.output_dir / "coverage.info"
         coverage_source_info = self.output_dir / "coverage_source.info"
         coverage_html_dir = self.tests_dir / "coverage_reports"
 
@@ -564,8 +781,7 @@ class AITestRunner:
         print(f"   Coverage will be generated from {total_individual_passed} passing test function(s)")
 
         # If there are no .gcda files, skip lcov capture and produce a minimal report
-        gcda_files = list(self.output_dir.rglob("*.gcda"))
-        if not gcda_files:
+        if not self._has_gcda_files():
             print("   ⚠️  No .gcda files found - skipping lcov capture and generating minimal coverage report")
             # Ensure coverage_reports directory exists and contains a small index.html so CI artifacts are created
             coverage_reports_path = self.tests_dir / "coverage_reports"
@@ -593,56 +809,19 @@ class AITestRunner:
             print("   Skipping detailed coverage generation due to missing instrumentation (.gcda files)")
             return True
 
-        # Capture coverage data
-        print("   Running: lcov --capture --directory . --output-file coverage.info --ignore-errors gcov,unused")
+        # Capture source-file coverage in one pass, filtering out Unity, main.c and tests
+        print("   Running: lcov --capture --directory . --include '*/src/*.c' --exclude '*/unity/*' --exclude '*/main.c' --output-file coverage_source.info --ignore-errors gcov,unused,empty")
         capture_result = subprocess.run(
-            ["lcov", "--capture", "--directory", ".", "--output-file", "coverage.info", "--ignore-errors", "gcov,unused"],
+            [self._lcov, "--capture", "--directory", ".",
+             "--include", "*/src/*.c", "--exclude", "*/unity/*", "--exclude", "*/main.c",
+             "--output-file", "coverage_source.info", "--ignore-errors", "gcov,unused,empty"],
             cwd=self.output_dir, capture_output=True, text=True, check=True
         )
         print(f"   lcov capture stdout: {capture_result.stdout}")
         if capture_result.stderr:
             print(f"   lcov capture stderr: {capture_result.stderr}")
 
-        # Check if coverage.info was created and has content
-        if coverage_info.exists():
-            size = coverage_info.stat().st_size
-            print(f"   coverage.info created, size: {size} bytes")
-            if size == 0:
-                print("   ⚠️  coverage.info is empty - no coverage data captured")
-                return False
-        else:
-            print("   ⚠️  coverage.info was not created")
-            return False
-
-        # Remove Unity framework and main.c from coverage data first
-        print("   Running: lcov --remove coverage.info '**/unity/**' '**/main.c' --output-file coverage_filtered.info")
-        remove_result = subprocess.run(
-            ["lcov", "--remove", "coverage.info", "**/unity/**", "**/main.c", "--output-file", "coverage_filtered.info", "--ignore-errors", "unused"],
-            cwd=self.output_dir, capture_output=True, text=True
-        )
-        if remove_result.returncode != 0:
-            print(f"   lcov remove failed: {remove_result.stderr}")
-            # Fallback: copy original coverage file
-            shutil.copy("coverage.info", "coverage_filtered.info")
-        else:
-            print("   Successfully removed Unity framework and main.c from coverage data")
-
-        # Extract coverage for source files only (exclude test files)
-        print("   Running: lcov --extract coverage_filtered.info '**/src/*.c' --output-file coverage_source.info")
-        extract_result = subprocess.run(
-            ["lcov", "--extract", "coverage_filtered.info", "**/src/*.c", "--output-file", "coverage_source.info", "--ignore-errors", "unused,empty"],
-            cwd=self.output_dir, capture_output=True, text=True
-        )
-        if extract_result.returncode != 0:
-            print(f"   lcov extract failed: {extract_result.stderr}")
-            # Fallback: use the filtered coverage data directly
-            print("   Using filtered coverage data as fallback...")
-            shutil.copy("coverage_filtered.info", "coverage_source.info")
-        else:
-            print("   Successfully extracted source file coverage")
-
         # Check if coverage_source.info has content
-        coverage_source_info = self.output_dir / "coverage_source.info"
         if coverage_source_info.exists():
             size = coverage_source_info.stat().st_size
             print(f"   coverage_source.info created, size: {size} bytes")
@@ -653,76 +832,159 @@ class AITestRunner:
             print("   ⚠️  coverage_source.info was not created")
             return False
 
-        # Generate HTML report
+        # Generate HTML report and console summary concurrently
         coverage_reports_path = self.tests_dir / "coverage_reports"
-        subprocess.run(
-            ["genhtml", "coverage_source.info", "--output-directory", str(coverage_reports_path)],
-            cwd=self.output_dir, capture_output=True, text=True, check=True
-        )
-
-        # Generate console summary
-        summary_result = subprocess.run(
-            ["lcov", "--list", "coverage_source.info"],
-            cwd=self.output_dir, capture_output=True, text=True, check=True
-        )
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            html_future = executor.submit(
+                subprocess.run,
+                [self._genhtml, "coverage_source.info", "--output-directory", str(coverage_reports_path)],
+                cwd=self.output_dir, capture_output=True, text=True, check=True
+            )
+            summary_future = executor.submit(
+                subprocess.run,
+                [self._lcov, "--list", "coverage_source.info"],
+                cwd=self.output_dir, capture_output=True, text=True, check=True
+            )
+            html_future.result()
+            summary_result = summary_future.result()
 
+        self.print_coverage_summary(summary_result.stdout)
         print(f"✅ Coverage report generated: {coverage_html_dir}")
         print("   📊 View the full coverage report in the HTML artifact or GitHub Pages.")
         return True
 
+    def _run_gcov_batches(self):
+        """Run gcov over the build's .gcda files in as few invocations as possible
+
+        gcov overwrites its output when inputs share a basename, so such files go
+        into separate batches, each writing into its own directory. Batches are
+        also split to keep each command line within _MAX_GCOV_ARGS_CHARS. Returns
+        True when .gcov files were produced for gcovr to reuse; otherwise gcovr
+        runs gcov itself.
+        """
+        gcov_path = _which("gcov")
+        if not gcov_path:
+            return False
+
+        gcov_dir = self.output_dir / "gcov"
+        shutil.rmtree(gcov_dir, ignore_errors=True)
+
+        batches = []
+        batch_chars = []
+        for root, _, files in os.walk(self.output_dir):
+            for name in files:
+                if not name.endswith('.gcda'):
+                    continue
+                path = os.path.join(root, name)
+                for index, batch in enumerate(batches):
+                    if name not in batch and batch_chars[index] + len(path) < _MAX_GCOV_ARGS_CHARS:
+                        batch[name] = path
+                        batch_chars[index] += len(path) + 1
+                        break
+                else:
+                    batches.append({name: path})
+                    batch_chars.append(len(path) + 1)
+
+        if not batches:
+            return False
+
+        def run_batch(index, batch):
+            batch_dir = gcov_dir / str(index)
+            batch_dir.mkdir(parents=True)
+            return subprocess.run(
+                # Same data options gcovr passes when it runs gcov itself, so function and
+                # branch coverage survive --use-gcov-files
+                [gcov_path, "--branch-counts", "--branch-probabilities", "--all-blocks",
+                 "--long-file-names", "--preserve-paths", *batch.values()],
+                cwd=batch_dir, capture_output=True, text=True
+            )
+
+        try:
+            with ThreadPoolExecutor(max_workers=os.cpu_count()) as executor:
+                results = list(executor.map(run_batch, range(len(batches)), batches))
+        except OSError:
+            results = None
+        if results and all(result.returncode == 0 for result in results):
+            return True
+        shutil.rmtree(gcov_dir, ignore_errors=True)
+        return False
+
     def _generate_coverage_gcovr(self, gcovr_path):
         """Generate coverage reports using gcovr"""
         coverage_html_dir = self.tests_dir / "coverage_reports"
 
-        # Generate HTML report and console summary with gcovr
-        print(f"   Running: {gcovr_path} --html --html-details --output coverage_reports/index.html --root . --filter src/ --exclude unity/ --exclude src/main.c")
-        gcovr_result = subprocess.run(
-            [gcovr_path, "--html", "--html-details", "--output", str(coverage_html_dir / "index.html"), "--root", ".", "--filter", "src/", "--exclude", "unity/", "--exclude", "src/main.c"],
-            cwd=self.output_dir, capture_output=True, text=True, check=True
-        )
+        coverage_html_dir.mkdir(parents=True, exist_ok=True)
+        jobs = str(os.cpu_count() or 1)
 
-        # Generate console summary
-        print(f"   Running: {gcovr_path} --root . --filter src/ --exclude unity/ --exclude src/main.c")
-        summary_result = subprocess.run(
-            [gcovr_path, "--root", ".", "--filter", "src/", "--exclude", "unity/", "--exclude", "src/main.c"],
-            cwd=self.output_dir, capture_output=True, text=True, check=True
-        )
+        # Generate the HTML report and a JSON summary for the console in a single gcovr
+        # pass (two concurrent gcovr runs would clobber each other's gcov output)
+        gcovr_cmd = [gcovr_path, "-j", jobs, "--html-details", str(coverage_html_dir / "index.html"),
+                     "--json-summary", "-",
+                     "--root", ".", "--filter", "src/", "--exclude", "unity/", "--exclude", "src/main.c"]
+
+        # Pre-run gcov in batches so gcovr does not fork one gcov per .gcda file
+        if self._run_gcov_batches():
+            gcovr_cmd.append("--use-gcov-files")
+
+        print(f"   Running: {' '.join(gcovr_cmd)}")
+        result = subprocess.run(gcovr_cmd, cwd=self.output_dir, capture_output=True)
+        if result.returncode != 0:
+            raise subprocess.CalledProcessError(
+                result.returncode, gcovr_cmd, stderr=result.stderr.decode('utf-8', errors='replace')
+            )
 
+        summary = self._parse_gcovr_json_summary(result.stdout)
+        if summary is not None:
+            self.print_coverage_summary_json(summary)
         print(f"✅ Coverage report generated: {coverage_html_dir}")
         print("   📊 View the full coverage report in the HTML artifact or GitHub Pages.")
         return True
 
-    def print_coverage_summary_gcovr(self, gcovr_output):
-        """Parse gcovr output and print a summary table
+    @staticmethod
+    def _parse_gcovr_json_summary(gcovr_json):
+        """Extract per-file line and function coverage from gcovr --json-summary output
 
-        gcovr output format is different from lcov:
-        - Lines: percentage (branches) total
-        - Functions: percentage (branches) total
+        Returns {file: (lines_hit, lines_total, functions_hit, functions_total)},
+        or None when the output cannot be decoded.
         """
-        print("\nCOVERAGE SUMMARY")
-        print("=" * 60)
-        print("Format: File | Lines | Functions | Coverage %")
-        print("-" * 60)
-
-        lines = gcovr_output.strip().split('\n')
+        try:
+            data = json.loads(gcovr_json)
+            return {
+                source['filename'].replace('\\', '/'): (
+                    source['line_covered'], source['line_total'],
+                    source.get('function_covered', 0), source.get('function_total', 0),
+                )
+                for source in sorted(data['files'], key=lambda source: source['filename'])
+            }
+        except (ValueError, KeyError, TypeError):
+            return None
+
+    def print_coverage_summary_json(self, summary):
+        """Print a summary table from _parse_gcovr_json_summary results"""
+        out = [
+            "\nCOVERAGE SUMMARY",
+            "=" * 60,
+            "Format: File | Lines (hit/total) | Functions (hit/total) | Coverage %",
+            "-" * 60,
+            f"{'File':<24} | {'Lines':>11} | {'Functions':>11} | {'Coverage':>8}",
+            "-" * 60,
+        ]
 
-        # Skip header lines and parse data
-        for line in lines:
-            line = line.strip()
-            if line and not line.startswith('TOTAL') and not line.startswith(' ') and not line.startswith('-') and '%' in line:
-                try:
-                    # Parse gcovr format: "file.c lines% (branches) total functions% (branches) total"
-                    parts = line.split()
-                    if len(parts) >= 7:
-                        filename = parts[0]
-                        lines_percent = parts[1].rstrip('%')
-                        functions_percent = parts[4].rstrip('%')
-
-                        print(f"{filename:<30} | {lines_percent:>6}% | {functions_percent:>9}% | {lines_percent:>10}%")
-                except (ValueError, IndexError):
-                    continue
+        total_lines = 0
+        total_lines_hit = 0
+        for filename, (lines_hit, lines_total, functions_hit, functions_total) in summary.items():
+            coverage_percent = (lines_hit / lines_total) * 100 if lines_total > 0 else 0
+            out.append(f"{filename:<24} | {f'{lines_hit}/{lines_total}':>11} | "
+                       f"{f'{functions_hit}/{functions_total}':>11} | {coverage_percent:>7.1f}%")
+            total_lines += lines_total
+            total_lines_hit += lines_hit
 
-        print("-" * 60)
+        out.append("-" * 60)
+        if total_lines > 0:
+            total_coverage = (total_lines_hit / total_lines) * 100
+            out.append(f"{'Total':<24} | {f'{total_lines_hit}/{total_lines}':>11} | {'':>11} | {total_coverage:>7.1f}%")
+        out.append("=" * 60)
+        sys.stdout.write("\n".join(out) + "\n")
 
     def print_coverage_summary(self, lcov_output):
         """Parse lcov output and print a summary table
@@ -737,74 +999,58 @@ class AITestRunner:
         ==============================================================
         temp_converter.c        |50.0%      6| 0.0%     3|    -      0
         """
-        print("\nCOVERAGE SUMMARY")
-        print("=" * 60)
-        print("Format: File | Lines (hit/total) | Coverage %")
-        print("-" * 60)
-        
-        lines = lcov_output.strip().split('\n')
-        
+        out = [
+            "\nCOVERAGE SUMMARY",
+            "=" * 60,
+            "Format: File | Lines (hit/total) | Coverage %",
+            "-" * 60,
+            f"{'File':<30} | {'Lines':>10} | {'Coverage':>10}",
+            "-" * 60,
+        ]
+
+        lines = lcov_output.splitlines()
+
         total_lines = 0
         total_lines_hit = 0
-        file_summaries = []
-        
-        # Parse lcov table format
-        parsing_table = False
+
+        # Parse table rows with format: "filename.c        |50.0%      6| 0.0%     3|    -      0"
+        # by slicing out the first "|...|" cell; header, separator and "-" rows are skipped
         for line in lines:
-            line = line.strip()
-            
-            # Skip header and separator lines
-            if '|Lines' in line or '=====' in line or '|Rate' in line:
-                parsing_table = True
+            # Drop lcov's banner, header, separator and directory lines in one C-level check
+            if line.startswith(('Reading', 'Filename', '=', '[', 'Message')):
                 continue
-            
-            # Parse table rows with format: "filename.c        |50.0%      6| 0.0%     3|    -      0"
-            if parsing_table and '|' in line and '%' in line:
-                try:
-                    # Split by pipe and parse the lines column (first data column)
-                    parts = line.split('|')
-                    if len(parts) >= 2:
-                        filename = parts[0].strip()
-                        lines_data = parts[1].strip()  # e.g., "50.0%      6"
-                        
-                        # Skip Total line, we'll calculate it ourselves
-                        if filename.lower() == 'total' or '=====' in filename:
-                            continue
-                        
-                        # Extract percentage and total lines
-                        data_parts = lines_data.split()
-                        if len(data_parts) >= 2:
-                            coverage_percent = float(data_parts[0].rstrip('%'))
-                            lines_total = int(data_parts[1])
-                            lines_hit = int((coverage_percent / 100.0) * lines_total)
-                            
-                            file_summaries.append({
-                                'file': filename,
-                                'lines_hit': lines_hit,
-                                'lines_total': lines_total
-                            })
-                            
-                            total_lines += lines_total
-                            total_lines_hit += lines_hit
-                except (ValueError, IndexError) as e:
-                    # Skip lines that don't match expected format
-                    continue
-        
-        # Print table
-        print(f"{'File':<30} | {'Lines':>10} | {'Coverage':>10}")
-        print("-" * 60)
-        
-        for summary in file_summaries:
-            lines_hit = summary['lines_hit']
-            lines_total = summary['lines_total']
-            coverage_percent = (lines_hit / lines_total) * 100 if lines_total > 0 else 0
-            print(f"{summary['file']:<30} | {lines_hit:>5}/{lines_total:<5} | {coverage_percent:>10.1f}%")
-        
-        print("-" * 60)
+            bar = line.find('|')
+            end = line.find('|', bar + 1) if bar >= 0 else -1
+            if end < 0:
+                continue
+            cell = line[bar + 1:end]
+            percent_end = cell.find('%')
+            if percent_end < 0:
+                continue
+            try:
+                coverage_percent = float(cell[:percent_end])
+                lines_total = int(cell[percent_end + 1:])
+            except ValueError:
+                continue
+
+            filename = line[:bar].strip()
+            # Skip Total line, we'll calculate it ourselves
+            if not filename or filename.rstrip(':').lower() == 'total':
+                continue
+
+            # lcov rounds the rate to one decimal, so round back to the nearest line count
+            lines_hit = round((coverage_percent / 100.0) * lines_total)
+            out.append(f"{filename:<30} | {lines_hit:>5}/{lines_total:<5} | {coverage_percent:>10.1f}%")
+
+            total_lines += lines_total
+            total_lines_hit += lines_hit
+
+        out.append("-" * 60)
         if total_lines > 0:
             total_coverage = (total_lines_hit / total_lines) * 100
-            print(f"{'Total':<30} | {f'{total_lines_hit}/{total_lines}':>10} | {f'{total_coverage:.1f}%':>10}")
-        print("=" * 60)
+            out.append(f"{'Total':<30} | {f'{total_lines_hit}/{total_lines}':>10} | {f'{total_coverage:.1f}%':>10}")
+        out.append("=" * 60)
+        sys.stdout.write("\n".join(out) + "\n")
 
     def print_summary(self, test_results):
         """Print test execution summary"""
@@ -843,15 +1089,59 @@ class AITestRunner:
 
     def find_test_files(self):
         """Find all test files, excluding test_main.c"""
-        test_files = []
-        if os.path.exists(os.path.join(self.output_dir, 'tests')):
-            for file in os.listdir(os.path.join(self.output_dir, 'tests')):
-                if file.endswith('.c') and file.startswith('test_'):
-                    # Skip test_main.c as main.c is not unit tested
-                    if file == 'test_main.c':
-                        continue
-                    test_files.append(file)
-        return test_files
+        try:
+            with os.scandir(self.output_dir / 'tests') as entries:
+                # Skip test_main.c as main.c is not unit tested
+                return [e.name for e in entries
+                        if e.name.startswith('test_') and e.name.endswith('.c')
+                        and e.name != 'test_main.c' and e.is_file(follow_symlinks=False)]
+        except FileNotFoundError:
+            return []
+
+    def _compute_input_digests(self, test_files):
+        """Hash the sources, headers and tests that feed the staged build tree, plus the runner"""
+        inputs = []
+        if self.source_dir.exists():
+            with os.scandir(self.source_dir) as entries:
+                inputs.extend(e.path for e in entries if e.name.endswith(('.c', '.h')))
+        inputs.extend(str(test_file) for test_file in test_files)
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            digests = executor.map(_file_digest, inputs)
+            result = {os.path.relpath(path, self.repo_path): digest for path, digest in zip(inputs, digests)}
+        result[_RUNNER_MANIFEST_KEY] = _file_digest(__file__)
+        return result
+
+    def _staged_tree_intact(self, digests):
+        """Check that CMakeLists.txt and every staged copy of the hashed inputs still exist
+
+        Sources and tests are staged under the same relative paths in the output
+        directory, so a partial clean is caught before the staged tree is reused.
+        """
+        if not (self.output_dir / 'CMakeLists.txt').exists():
+            return False
+        return all((self.output_dir / path).exists() for path in digests if path != _RUNNER_MANIFEST_KEY)
+
+    def _load_manifest(self):
+        """Return the input digests recorded by the last successful build, if any"""
+        try:
+            with open(self.output_dir / _MANIFEST_NAME) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _save_manifest(self, digests):
+        """Record the input digests of a successful build"""
+        with open(self.output_dir / _MANIFEST_NAME, 'w') as f:
+            json.dump(digests, f, indent=2, sort_keys=True)
+
+    @staticmethod
+    def _remove_coverage_file(path):
+        """Delete one stale coverage data file, ignoring files that are already gone"""
+        try:
+            os.unlink(path)
+        except OSError:
+            pass
 
     def run(self):
         """Main execution flow"""
@@ -868,28 +1158,29 @@ class AITestRunner:
 
         # Set up build environment
         self.copy_unity_framework()
-        self.copy_source_files()
-        self.copy_test_files(compilable_tests)
-        self.create_cmake_lists(compilable_tests)
+        input_digests = self._compute_input_digests(compilable_tests)
+        if input_digests == self._load_manifest() and self._staged_tree_intact(input_digests):
+            print("✅ Sources and tests unchanged, reusing staged build tree")
+        else:
+            self.copy_source_files()
+            self.copy_test_files(compilable_tests)
+            self.create_cmake_lists(compilable_tests)
 
-        # Clean any existing .gcda/.gcno files from previous runs before building
+        # Clean any existing .gcda files from previous runs before building. Staged
+        # files keep their source mtimes, so unchanged objects are not recompiled and
+        # their .gcno notes files must be kept; the compiler rewrites them on rebuild.
         print("   Cleaning old coverage data...")
-        for gcda_file in self.output_dir.rglob("*.gcda"):
-            try:
-                gcda_file.unlink()
-                print(f"   Removed old coverage file: {gcda_file.name}")
-            except OSError:
-                pass
-        for gcno_file in self.output_dir.rglob("*.gcno"):
-            try:
-                gcno_file.unlink()
-                print(f"   Removed old coverage file: {gcno_file.name}")
-            except OSError:
-                pass
+        coverage_files = [os.path.join(root, name)
+                          for root, _, files in os.walk(self.output_dir)
+                          for name in files if name.endswith('.gcda')]
+        with ThreadPoolExecutor(max_workers=16) as executor:
+            list(executor.map(self._remove_coverage_file, coverage_files))
+        print(f"   Removed {len(coverage_files)} .gcda files")
 
         # Build tests
         if not self.build_tests():
             return False
+        self._save_manifest(input_digests)
 
         # Run tests
         test_results = self.run_tests()
@@ -968,7 +1259,7 @@ Examples:
     missing_tools = []
 
     for tool in required_tools:
-        if not shutil.which(tool):
+        if not _which(tool):
             missing_tools.append(tool)
 
     if missing_tools:
@@ -1,5 +1,6 @@
 """Tests for AI Test Runner CLI."""
 
+import json
 import os
 import pytest
 import subprocess
@@ -7,38 +8,35 @@ from unittest.mock import patch, MagicMock
 from ai_test_runner.cli import main, AITestRunner
 
 
+def _mock_process(returncode, stdout_lines, stderr):
+    """Build a Popen stand-in that streams the given stdout lines."""
+    process = MagicMock()
+    process.stdout.readline.side_effect = list(stdout_lines) + [b'']
+    process.stderr.read.return_value = stderr
+    process.wait.return_value = returncode
+    process.poll.return_value = returncode
+    return process
+
+
 class TestAITestRunner:
     """Test the AITestRunner class."""
 
-    @patch('ai_test_runner.cli.subprocess.run')
-    @patch('ai_test_runner.cli.shutil.copytree')
-    @patch('ai_test_runner.cli.shutil.copy2')
-    @patch('ai_test_runner.cli.Path')
-    def test_find_compilable_tests(self, mock_path, mock_copy2, mock_copytree, mock_subprocess):
+    def test_find_compilable_tests(self, tmp_path):
         """Test finding compilable tests."""
-        # Mock Path to avoid directory creation issues
-        mock_path_instance = MagicMock()
-        mock_path.return_value = mock_path_instance
+        runner = AITestRunner(repo_path=str(tmp_path))
 
-        runner = AITestRunner(repo_path='/fake/path')
+        # Populate a real verification directory
+        runner.verification_dir = tmp_path
+        (tmp_path / 'test1_compiles_yes.txt').touch()
+        (tmp_path / 'test2_compiles_yes.txt').touch()
+        (tmp_path / 'test3_compiles_no.txt').touch()
 
-        # Mock the verification directory methods
-        runner.verification_dir = MagicMock()
-        runner.verification_dir.exists.return_value = True
-        runner.verification_dir.glob.return_value = [
-            MagicMock(stem='test1_compiles_yes'),
-            MagicMock(stem='test2_compiles_yes'),
-        ]
-
-        # Mock the tests directory and test files
-        runner.tests_dir = MagicMock()
-        def mock_truediv(filename):
-            mock_file = MagicMock()
-            mock_file.exists.return_value = True
-            mock_file.stem = filename.replace('.c', '')
-            mock_file.name = filename
-            return mock_file
-        runner.tests_dir.__truediv__.side_effect = mock_truediv
+        # Populate the tests directory; test4 compiles but has no test file
+        runner.tests_dir = tmp_path / 'tests'
+        runner.tests_dir.mkdir(exist_ok=True)
+        (runner.tests_dir / 'test1.c').touch()
+        (runner.tests_dir / 'test2.c').touch()
+        (tmp_path / 'test4_compiles_yes.txt').touch()
 
         tests = runner.find_compilable_tests()
 
@@ -46,6 +44,8 @@ class TestAITestRunner:
         # Tests should now be Path objects, not strings
         assert tests[0].stem in ['test1', 'test2']
         assert tests[1].stem in ['test1', 'test2']
+        # Results are cached for later pipeline stages
+        assert runner.find_compilable_tests() is tests
 
     @patch('ai_test_runner.cli.subprocess.run')
     def test_build_tests_success(self, mock_subprocess):
@@ -68,21 +68,22 @@ class TestAITestRunner:
 
         assert result is False
 
-    @patch('ai_test_runner.cli.os.access')
-    @patch('ai_test_runner.cli.subprocess.run')
-    def test_run_tests_success(self, mock_subprocess, mock_access):
+    @patch('ai_test_runner.cli.os.scandir')
+    @patch('ai_test_runner.cli.subprocess.Popen')
+    def test_run_tests_success(self, mock_subprocess, mock_scandir):
         """Test successful test execution."""
-        mock_subprocess.return_value = MagicMock(returncode=0, stdout='All tests passed', stderr='')
-        mock_access.return_value = True
+        mock_subprocess.return_value = _mock_process(
+            0, [b'test_main.c:5:test_ok:PASS\n', b'1 Tests 0 Failures 0 Ignored\n', b'OK\n'], b''
+        )
 
         runner = AITestRunner(repo_path='/fake/path')
         # Mock some test executables
-        runner.output_dir = MagicMock()
         mock_exe = MagicMock()
         mock_exe.is_file.return_value = True
         mock_exe.name = 'test_main.exe'
-        mock_exe.suffix = '.exe'
-        runner.output_dir.glob.return_value = [mock_exe]
+        mock_exe.path = '/fake/path/build/test_main.exe'
+        mock_exe.stat.return_value.st_mode = 0o100755
+        mock_scandir.return_value.__enter__.return_value = [mock_exe]
 
         results = runner.run_tests()
 
@@ -90,22 +91,23 @@ class TestAITestRunner:
         # Should have one result for the successful test
         assert len(results) == 1
         assert results[0]['success']
+        assert results[0]['individual_tests'] == 1
+        assert results[0]['individual_passed'] == 1
 
-    @patch('ai_test_runner.cli.os.access')
-    @patch('ai_test_runner.cli.subprocess.run')
-    def test_run_tests_failure(self, mock_subprocess, mock_access):
+    @patch('ai_test_runner.cli.os.scandir')
+    @patch('ai_test_runner.cli.subprocess.Popen')
+    def test_run_tests_failure(self, mock_subprocess, mock_scandir):
         """Test test execution with failures."""
-        mock_subprocess.return_value = MagicMock(returncode=1, stdout='', stderr='Test failed')
-        mock_access.return_value = True
+        mock_subprocess.return_value = _mock_process(1, [], b'Test failed')
 
         runner = AITestRunner(repo_path='/fake/path')
         # Mock some test executables
-        runner.output_dir = MagicMock()
         mock_exe = MagicMock()
         mock_exe.is_file.return_value = True
         mock_exe.name = 'test_main.exe'
-        mock_exe.suffix = '.exe'
-        runner.output_dir.glob.return_value = [mock_exe]
+        mock_exe.path = '/fake/path/build/test_main.exe'
+        mock_exe.stat.return_value.st_mode = 0o100755
+        mock_scandir.return_value.__enter__.return_value = [mock_exe]
 
         results = runner.run_tests()
 
@@ -113,6 +115,125 @@ class TestAITestRunner:
         # Should have one result for the failed test
         assert len(results) == 1
         assert not results[0]['success']
+        assert results[0]['errors'] == 'Test failed'
+
+    @patch('ai_test_runner.cli.os.scandir')
+    @patch('ai_test_runner.cli.subprocess.Popen')
+    def test_run_tests_output_cap(self, mock_subprocess, mock_scandir):
+        """Test that oversized output is truncated in the report."""
+        mock_subprocess.return_value = _mock_process(0, [b'a' * (1024 * 1024), b'OK\n'], b'')
+
+        runner = AITestRunner(repo_path='/fake/path')
+        mock_exe = MagicMock()
+        mock_exe.is_file.return_value = True
+        mock_exe.name = 'test_main.exe'
+        mock_exe.path = '/fake/path/build/test_main.exe'
+        mock_exe.stat.return_value.st_mode = 0o100755
+        mock_scandir.return_value.__enter__.return_value = [mock_exe]
+
+        output = runner.run_tests()[0]['output']
+
+        assert len(output) < 64 * 1024 + 100
+        assert "bytes of output truncated" in output
+        assert output.endswith("OK\n")
+
+    def test_stubbed_function_detection(self, tmp_path):
+        """Test stub detection in a generated test file."""
+        test_file = tmp_path / "test_sensor.c"
+        test_file.write_text(
+            "float read_adc(int channel) { return 1.0f; }\n"
+            "void setUp(void) {}\n"
+            "void test_read(void) { TEST_ASSERT_EQUAL(1, 1); }\n"
+            "int main(void) { return 0; }\n"
+            "static int read_register(int bank,\n"
+            "                         int offset)\n"
+            "{\n"
+            "    return 0;\n"
+            "}\n"
+        )
+
+        runner = AITestRunner(repo_path='/fake/path')
+
+        assert runner.get_stubbed_functions_in_test(str(test_file)) == {'read_adc', 'setUp', 'main', 'read_register'}
+        assert runner._find_stubbed_functions(str(test_file)) == {'read_adc', 'read_register'}
+        assert runner._find_stubbed_functions(str(tmp_path / "missing.c")) == set()
+
+    def test_input_manifest(self, tmp_path):
+        """Test that input digests round-trip and change with file contents."""
+        (tmp_path / 'src').mkdir()
+        (tmp_path / 'tests').mkdir()
+        (tmp_path / 'src' / 'sensor.c').write_text('int read(void) { return 1; }\n')
+        test_file = tmp_path / 'tests' / 'test_sensor.c'
+        test_file.write_text('void test_read(void) {}\n')
+
+        runner = AITestRunner(repo_path=str(tmp_path))
+        assert runner._load_manifest() is None
+
+        digests = runner._compute_input_digests([test_file])
+        assert {os.path.join('src', 'sensor.c'), os.path.join('tests', 'test_sensor.c')} < set(digests)
+        runner._save_manifest(digests)
+        assert runner._load_manifest() == digests
+
+        # The staged tree is only reused while every staged copy is present
+        assert not runner._staged_tree_intact(digests)
+        runner.copy_source_files()
+        runner.copy_test_files([test_file])
+        (runner.output_dir / 'CMakeLists.txt').touch()
+        assert runner._staged_tree_intact(digests)
+        (runner.output_dir / 'src' / 'sensor.c').unlink()
+        assert not runner._staged_tree_intact(digests)
+
+        test_file.write_text('void test_read(void) { }\n')
+        assert runner._compute_input_digests([test_file]) != digests
+
+    def test_print_coverage_summary(self, capsys):
+        """Test parsing of lcov --list output."""
+        lcov_output = (
+            "Reading tracefile coverage_source.info\n"
+            "                  |Lines       |Functions  |Branches\n"
+            "Filename          |Rate     Num|Rate    Num|Rate     Num\n"
+            "=========================================================\n"
+            "temp_converter.c  |50.0%      6| 0.0%     3|    -      0\n"
+            "sensor.c          | 100%      4| 100%     2|    -      0\n"
+            "=========================================================\n"
+            "            Total:|70.0%     10|40.0%     5|    -      0\n"
+        )
+
+        runner = AITestRunner(repo_path='/fake/path')
+        runner.print_coverage_summary(lcov_output)
+
+        output = capsys.readouterr().out
+        assert "temp_converter.c" in output and "3/6" in output
+        assert "sensor.c" in output and "4/4" in output
+        assert "7/10" in output
+        assert "70.0%" in output
+
+        # Rates are rounded to one decimal, so line counts are rounded back
+        runner.print_coverage_summary("util.c            |33.3%      3| 0.0%     1|    -      0\n")
+        assert "1/3" in capsys.readouterr().out
+
+    def test_gcovr_json_summary(self, capsys):
+        """Test printing gcovr --json-summary output."""
+        gcovr_json = json.dumps({
+            "root": ".",
+            "files": [
+                {"filename": "src/sensor.c", "line_total": 5, "line_covered": 3,
+                 "function_total": 2, "function_covered": 1},
+                {"filename": "src/calc.c", "line_total": 2, "line_covered": 2,
+                 "function_total": 2, "function_covered": 2},
+            ],
+        }).encode()
+
+        runner = AITestRunner(repo_path='/fake/path')
+        summary = runner._parse_gcovr_json_summary(gcovr_json)
+        assert summary == {'src/calc.c': (2, 2, 2, 2), 'src/sensor.c': (3, 5, 1, 2)}
+
+        runner.print_coverage_summary_json(summary)
+        output = capsys.readouterr().out
+        assert "src/sensor.c" in output and "3/5" in output and "1/2" in output
+        assert "5/7" in output and "71.4%" in output
+
+        assert runner._parse_gcovr_json_summary(b'not json') is None
 
 
 class TestCLI: